@@ -30,6 +30,13 @@
 import json
 from enum import Enum, unique
 
+#orjson parses straight from str or bytes considerably faster than
+#the stdlib tokenizer; degrade gracefully where it is not installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 @unique
 class PREFERENCE_KEY(Enum):
     """Key used in the JSON preference store
@@ -49,8 +56,8 @@ class DICEPreferences():
         self._read_prefs()
 
     def _read_prefs(self):
-        with open(self._path,"r") as file:
-            self._prefs = json.load(file)
+        with open(self._path,"rb") as file:
+            self._prefs = _json_loads(file.read())
 
     def _write_prefs(self)->bool:
         try:
@@ -37,27 +37,47 @@ Classes:
  POSSIBILITY OF SUCH DAMAGE.
 
 """
-from email import message
 import sys
 from abc import ABC, abstractmethod
-from enum import Enum, unique
 import os
-import time
+import selectors
 import threading
-import json
-import random
+import secrets
+import functools
+from collections import deque
+from concurrent.futures import Future
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import (QWidgetAction,QLabel,QApplication,
-    QSystemTrayIcon, QMenu, QVBoxLayout, QFrame, QHBoxLayout, QCheckBox,
-    QAction, QDialog,QPushButton, QDesktopWidget, QGraphicsDropShadowEffect,
-    QLineEdit)
-from PyQt5.QtCore import QObject, Qt, QEvent, QTimer, pyqtSlot, pyqtSignal
+from PyQt5.QtWidgets import (QLabel,QApplication,
+    QSystemTrayIcon, QMenu, QVBoxLayout, QFrame, QHBoxLayout,
+    QAction, QDialog,QPushButton, QLineEdit)
+from PyQt5.QtCore import (QObject, Qt, QTimer, QMetaObject, Q_ARG,
+    QRunnable, QThreadPool, pyqtSlot, pyqtSignal)
 from compendium.client import Compendium
-from compendium.utils import B64
+from compendium.utils import CryptoUtils
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+#orjson parses straight from str or bytes considerably faster than
+#the stdlib tokenizer; degrade gracefully where it is not installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from authenticator.preferences import DICEPreferences
-result_available = threading.Event()
-result = None
+from crypto import b64
+
+_PARENT_PATH = os.path.dirname(os.path.abspath(__file__))
+_BG_URL = _PARENT_PATH + "/icons/bgpy.png"
+_STYLESHEET = ("#header {font-weight:bold; text-align:center;}\n"
+    "*[bgFrame='true'] {border-image: url(" + _BG_URL + ") 0 0 0 0 stretch stretch;}")
+
+#Constant names and purposes shown on the Companion Device, interned
+#so every request passes the same string object to the Compendium API
+_APP_NAME = sys.intern("Virtual Authenticator")
+_APP_NAME_UV = sys.intern("Virtual Authenticator UV")
+_PURPOSE_ENC = sys.intern("Encrypt Config Data")
+_PURPOSE_REG = sys.intern("Register for User Verification")
 class DICEAuthenticatorListener(ABC):
     """Defines the listener interface for authenticators
     that wish to listen to UI events
@@ -89,6 +109,9 @@ class DICEAuthenticatorUI(ABC):
     """
     def __init__(self):
         self._listeners = []
+        self._shutdown_handlers = []
+        self._menu_handlers = []
+        self._load_handlers = []
 
 
     @abstractmethod
@@ -100,10 +123,17 @@ class DICEAuthenticatorUI(ABC):
     def add_listener(self, listener:DICEAuthenticatorListener):
         """Adds a listener to receive UI events
 
+        The listener's handlers are resolved to bound methods once at
+        registration so the fire methods avoid per-call attribute
+        lookups
+
         Args:
             listener (DICEAuthenticatorListener): listener to be added
         """
         self._listeners.append(listener)
+        self._shutdown_handlers.append(listener.shutdown)
+        self._menu_handlers.append(listener.menu_clicked)
+        self._load_handlers.append(listener.post_ui_load)
 
     @abstractmethod
     def check_user_presence(self, msg:str=None):
@@ -145,8 +175,8 @@ class DICEAuthenticatorUI(ABC):
     def fire_event_shutdown(self):
         """Fires the shutdown event to all listeners
         """
-        for listener in self._listeners:
-            listener.shutdown()
+        for handler in self._shutdown_handlers:
+            handler()
 
     def fire_menu_clicked(self, menu_item:str):
         """Fires the menu clicked event
@@ -154,8 +184,8 @@ class DICEAuthenticatorUI(ABC):
         Args:
             menu_item (str): menu item that was clicked
         """
-        for listener in self._listeners:
-            listener.menu_clicked(menu_item)
+        for handler in self._menu_handlers:
+            handler(menu_item)
 
     def fire_post_ui_loaded(self):
         """Fires the menu clicked event
@@ -163,9 +193,8 @@ class DICEAuthenticatorUI(ABC):
         Args:
             menu_item (str): menu item that was clicked
         """
-        time.sleep(0.05)
-        for listener in self._listeners:
-            listener.post_ui_load()
+        for handler in self._load_handlers:
+            handler()
 
 class ConsoleAuthenticatorUI(DICEAuthenticatorUI):
     """Simple console UI to allow the user to perform
@@ -175,17 +204,30 @@ class ConsoleAuthenticatorUI(DICEAuthenticatorUI):
     def __init__(self):
         super().__init__()
         self.type="Console"
+        self._stop = False
 
     def start(self):
-        while 1:
-            for line in sys.stdin:
-                if line.rstrip() == "quit":
+        selector = selectors.DefaultSelector()
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        buffer = bytearray()
+        while not self._stop:
+            if not selector.select(timeout=0.25):
+                continue
+            data = os.read(sys.stdin.fileno(), 4096)
+            if not data:
+                continue
+            buffer.extend(data)
+            while b"\n" in buffer:
+                line, _, buffer = buffer.partition(b"\n")
+                buffer = bytearray(buffer)
+                command = line.decode("UTF-8").rstrip()
+                if command == "quit":
                     #This doesn't actually kill the thread because
                     #python handles threads in a slightly odd way
                     self.fire_event_shutdown()
                     sys.exit()
                 else:
-                    print("Unknown command entered on CLI: %s" % line.rstrip() )
+                    print("Unknown command entered on CLI: %s" % command)
 
     def check_user_presence(self, msg:str=None):
         pass
@@ -200,35 +242,10 @@ class ConsoleAuthenticatorUI(DICEAuthenticatorUI):
         pass
 
     def shutdown(self):
+        self._stop = True
         self.fire_event_shutdown()
         sys.exit(0)
 
-@unique
-class DICE_UI_Event(Enum):
-    """Enum to define different event types in the DICE app
-
-    """
-    SHOW_UP = QEvent.Type(QEvent.registerEventType())
-    SHOW_UV = QEvent.Type(QEvent.registerEventType())
-    CHECK_UV = QEvent.Type(QEvent.registerEventType())
-    SHOW_PWD = QEvent.Type(QEvent.registerEventType())
-class DICEEvent(QEvent):
-    """Holds a DICE Event that represents one of the types
-    and potentially includes a message as well
-
-    """
-    def __init__(self,action:DICE_UI_Event):
-        QEvent.__init__(self, action.value)
-        self.dice_type = action
-        self.msg = ""
-    def set_message(self, msg:str):
-        """Sets the underlying message for this event
-
-        Args:
-            msg (str): Message for this event
-        """
-        self.msg = msg
-
 class QTAuthenticatorUIApp(QApplication):
     """QT5 UI with system tray icon
 
@@ -238,54 +255,121 @@ class QTAuthenticatorUIApp(QApplication):
         self.pwd_box = None
         self.dialog = None
         self.pwd_box_uv = None
-    def customEvent(self, event):
-        """Processes the custom event firing
+        self._pending_future = None
+        self._pending_lock = threading.Lock()
+        self._dialogs = []
+        self._dialog_geometry = self._compute_dialog_geometry()
+        self.screenAdded.connect(self._screens_changed)
+        self.screenRemoved.connect(self._screens_changed)
+        self._build_up_dialog()
+        self._build_pwd_dialog()
+        self._build_uv_dialog()
+
+    def _begin_request(self, future:Future):
+        """Installs the future for a new UI request
+
+        Requests can originate from more than one thread, so the
+        pending slot is swapped under a lock. If an earlier request
+        was still pending its future is failed rather than silently
+        dropped, so that caller is woken instead of blocking forever.
 
         Args:
-            event (DICEevent): event that has been fired
+            future (Future): future the new caller will wait on
         """
+        with self._pending_lock:
+            superseded = self._pending_future
+            self._pending_future = future
+        if superseded is not None and not superseded.done():
+            superseded.set_exception(
+                RuntimeError("UI request superseded by a newer request"))
 
-        if event.dice_type == DICE_UI_Event.SHOW_UP:
-            self.show_user_presence(event.msg)
-        if event.dice_type == DICE_UI_Event.SHOW_PWD:
-            self.get_user_password(event.msg)
-        if event.dice_type == DICE_UI_Event.SHOW_UV:
-            self.get_user_verification(event.msg)
-        if event.dice_type == DICE_UI_Event.CHECK_UV:
-            self.register_for_user_verification()
+    def _deliver_result(self, value):
+        """Delivers the result of the current request to the
+        future that accompanied it
 
+        Args:
+            value: result to deliver to the waiting caller
+        """
+        with self._pending_lock:
+            future = self._pending_future
+            self._pending_future = None
+        if future is not None and not future.done():
+            future.set_result(value)
 
+    def _compute_dialog_geometry(self)->tuple:
+        """Computes the notification dialog position from the primary
+        screen geometry
 
+        Returns:
+            tuple: (x, y, width, height) to use for dialogs
+        """
+        screen_shape = self.primaryScreen().geometry()
+        return (screen_shape.width()-440,0,350,200)
 
-    def show_user_presence(self, msg:str="User Presence Check"):
-        """Shows the user presence check dialog
+    def _screens_changed(self, _screen):
+        """Recomputes the cached dialog geometry when a screen is
+        added or removed and repositions the prebuilt dialogs
 
         Args:
-            msg (str, optional): The message to show the user in dialog.
-                Defaults to "User Presence Check".
+            _screen (QScreen): screen that was added or removed
+        """
+        self._dialog_geometry = self._compute_dialog_geometry()
+        for dialog in self._dialogs:
+            dialog.setGeometry(*self._dialog_geometry)
+
+    def _build_notification_dialog(self, body_widgets:list)->QDialog:
+        """Builds the common frameless notification dialog shell
+
+        Creates the translucent dialog, background frame, stylesheet
+        and header shared by every notification, then adds the supplied
+        body widgets to the content layout in order.
+
+        Args:
+            body_widgets (list): widgets to add below the header
+
+        Returns:
+            QDialog: constructed dialog, positioned ready to show
         """
-        self.dialog = QDialog(flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.dialog.setAttribute(Qt.WA_TranslucentBackground)
-        parent_path = os.path.dirname(os.path.abspath(__file__))
-        outer_layout = QVBoxLayout(self.dialog)
+        dialog = QDialog(flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        dialog.setAttribute(Qt.WA_TranslucentBackground)
+        outer_layout = QVBoxLayout(dialog)
         outer_layout.setContentsMargins(0,0,0,0)
         outer_frame = QFrame()
 
         outer_frame.setProperty("bgFrame",True)
-        outer_frame.setStyleSheet("#header {font-weight:bold; text-align:center;}\n\
-        *[bgFrame='true'] {border-image: url(" + parent_path +"/icons/bgpy.png" +")\
-             0 0 0 0 stretch stretch;}")
-
+        outer_frame.setStyleSheet(_STYLESHEET)
         outer_layout.addWidget(outer_frame)
         layout = QVBoxLayout(outer_frame)
-        header = QLabel("DICE Key Notification");
+        header = QLabel("DICE Key Notification")
         header.setObjectName("header")
         header.setAlignment(Qt.AlignCenter)
         layout.addWidget(header)
-        label = QLabel(msg)
+        for widget in body_widgets:
+            layout.addWidget(widget)
+        outer_frame.setLayout(layout)
+        dialog.setLayout(outer_layout)
+
+        dialog.setGeometry(*self._dialog_geometry)
+        self._dialogs.append(dialog)
+        return dialog
+
+    @staticmethod
+    def _make_message_label()->QLabel:
+        """Creates a centred, word wrapped label for dialog messages
+
+        Returns:
+            QLabel: empty label ready for setText
+        """
+        label = QLabel()
         label.setWordWrap(True)
         label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
+        return label
+
+    def _build_up_dialog(self):
+        """Builds the user presence dialog once so it can be
+        reused on every prompt
+        """
+        self._up_label = self._make_message_label()
         frame = QFrame()
         blayout = QHBoxLayout(frame)
         allow_button = QPushButton("Allow")
@@ -295,43 +379,13 @@ class QTAuthenticatorUIApp(QApplication):
         blayout.addWidget(allow_button)
         blayout.addWidget(deny_button)
         frame.setLayout(blayout)
-        layout.addWidget(frame)
-        outer_frame.setLayout(layout)
-        self.dialog.setLayout(outer_layout)
+        self._up_dialog = self._build_notification_dialog([self._up_label, frame])
 
-
-        screen_shape = QDesktopWidget().screenGeometry()
-        self.dialog.setGeometry(screen_shape.width()-440,0,350,200)
-        self.dialog.show()
-
-    def get_user_password(self, msg:str="Enter Password"):
-        """Shows the user password dialog
-
-        Args:
-            msg (str, optional): The message to show the user in the dialog.
-                Defaults to "Enter Password".
+    def _build_pwd_dialog(self):
+        """Builds the password dialog once so it can be
+        reused on every prompt
         """
-        self.dialog = QDialog(flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.dialog.setAttribute(Qt.WA_TranslucentBackground)
-        parent_path = os.path.dirname(os.path.abspath(__file__))
-        outer_layout = QVBoxLayout(self.dialog)
-        outer_layout.setContentsMargins(0,0,0,0)
-        outer_frame = QFrame()
-
-        outer_frame.setProperty("bgFrame",True)
-        outer_frame.setStyleSheet("#header {font-weight:bold; text-align:center;}\n\
-        *[bgFrame='true'] {border-image: url(" + parent_path +"/icons/bgpy.png" +")\
-            0 0 0 0 stretch stretch;}")
-        outer_layout.addWidget(outer_frame)
-        layout = QVBoxLayout(outer_frame)
-        header = QLabel("DICE Key Notification");
-        header.setObjectName("header")
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-        label = QLabel(msg)
-        label.setWordWrap(True)
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
+        self._pwd_label = self._make_message_label()
         frame = QFrame()
         blayout = QHBoxLayout(frame)
         self.pwd_box = QLineEdit()
@@ -341,52 +395,19 @@ class QTAuthenticatorUIApp(QApplication):
         submit_button.clicked.connect(self._submit_pwd_button_clicked)
         blayout.addWidget(submit_button)
         frame.setLayout(blayout)
-        layout.addWidget(frame)
-        outer_frame.setLayout(layout)
-        self.dialog.setLayout(outer_layout)
-
-
-        screen_shape = QDesktopWidget().screenGeometry()
-
-        self.pwd_box.setFocus()
-        self.dialog.setGeometry(screen_shape.width()-440,0,350,200)
-        self.dialog.show()
-
-    def get_user_verification(self, msg:str="Enter Password"):
-        """Shows the user verification dialog
+        self._pwd_dialog = self._build_notification_dialog([self._pwd_label, frame])
 
-        Args:
-            msg (str, optional): Message to show the user in the dialog.
-                Defaults to "Enter Password".
+    def _build_uv_dialog(self):
+        """Builds the user verification dialog once so it can be
+        reused on every prompt
         """
-        self.dialog = QDialog(flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.dialog.setAttribute(Qt.WA_TranslucentBackground)
-        parent_path = os.path.dirname(os.path.abspath(__file__))
-        outer_layout = QVBoxLayout(self.dialog)
-        outer_layout.setContentsMargins(0,0,0,0)
-        outer_frame = QFrame()
-
-        outer_frame.setProperty("bgFrame",True)
-        outer_frame.setStyleSheet("#header {font-weight:bold; text-align:center;}\n\
-        *[bgFrame='true'] {border-image: url(" + parent_path +"/icons/bgpy.png" +")\
-             0 0 0 0 stretch stretch;}")
-        outer_layout.addWidget(outer_frame)
-        layout = QVBoxLayout(outer_frame)
-        header = QLabel("DICE Key Notification")
-        header.setObjectName("header")
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-        label = QLabel(msg)
-        label.setWordWrap(True)
-        label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(label)
+        self._uv_label = self._make_message_label()
         frame = QFrame()
         blayout = QHBoxLayout(frame)
         self.pwd_box_uv = QLineEdit()
         self.pwd_box_uv.setEchoMode(QLineEdit.Password)
         blayout.addWidget(self.pwd_box_uv)
         frame.setLayout(blayout)
-        layout.addWidget(frame)
 
         framebtn = QFrame()
         btnlayout = QHBoxLayout(framebtn)
@@ -397,16 +418,52 @@ class QTAuthenticatorUIApp(QApplication):
         btnlayout.addWidget(allow_button)
         btnlayout.addWidget(deny_button)
         framebtn.setLayout(btnlayout)
-        layout.addWidget(framebtn)
+        self._uv_dialog = self._build_notification_dialog(
+            [self._uv_label, frame, framebtn])
 
-        outer_frame.setLayout(layout)
-        self.dialog.setLayout(outer_layout)
+    @pyqtSlot(str)
+    def show_user_presence(self, msg:str="User Presence Check"):
+        """Shows the user presence check dialog
 
+        Args:
+            msg (str, optional): The message to show the user in dialog.
+                Defaults to "User Presence Check".
+        """
+        self._up_label.setText(msg)
+        self.dialog = self._up_dialog
+        self.dialog.show()
+        self.dialog.raise_()
+
+    @pyqtSlot(str)
+    def get_user_password(self, msg:str="Enter Password"):
+        """Shows the user password dialog
 
-        screen_shape = QDesktopWidget().screenGeometry()
-        self.dialog.setGeometry(screen_shape.width()-440,0,350,200)
+        Args:
+            msg (str, optional): The message to show the user in the dialog.
+                Defaults to "Enter Password".
+        """
+        self._pwd_label.setText(msg)
+        self.pwd_box.clear()
+        self.dialog = self._pwd_dialog
+        self.pwd_box.setFocus()
+        self.dialog.show()
+        self.dialog.raise_()
+
+    @pyqtSlot(str)
+    def get_user_verification(self, msg:str="Enter Password"):
+        """Shows the user verification dialog
+
+        Args:
+            msg (str, optional): Message to show the user in the dialog.
+                Defaults to "Enter Password".
+        """
+        self._uv_label.setText(msg)
+        self.pwd_box_uv.clear()
+        self.dialog = self._uv_dialog
         self.pwd_box_uv.setFocus()
         self.dialog.show()
+        self.dialog.raise_()
+    @pyqtSlot()
     def register_for_user_verification(self):
         """Function for Compendium use to trigger a registration
         for the User Verification key
@@ -415,24 +472,20 @@ class QTAuthenticatorUIApp(QApplication):
     def _perm_button_clicked(self, outcome:bool):
         #self.user_presence_allow = outcome
         self.dialog.close()
-        global result
-        result = outcome
-        result_available.set()
+        self._deliver_result(outcome)
 
     def _submit_pwd_button_clicked(self):
-        global result
-        result = self.pwd_box.text()
+        value = self.pwd_box.text()
         self.dialog.close()
-        result_available.set()
+        self._deliver_result(value)
 
     def _uv_button_clicked(self, approved:bool):
-        global result
         if approved:
-            result = self.pwd_box_uv.text()
+            value = self.pwd_box_uv.text()
         else:
-            result = False
+            value = False
         self.dialog.close()
-        result_available.set()
+        self._deliver_result(value)
 
 class QTAuthenticatorUI(DICEAuthenticatorUI):
     """QT based UI that provides a system tray icon and more
@@ -441,12 +494,12 @@ class QTAuthenticatorUI(DICEAuthenticatorUI):
     def __init__(self):
         super().__init__()
         self.app=None
-        self._listeners = []
         self.tray = None
         self.object = None
         self.dialog = None
         self.user_presence_allow = False
         self.menu = None
+        self._ui_ready = threading.Event()
 
 
 
@@ -459,13 +512,19 @@ class QTAuthenticatorUI(DICEAuthenticatorUI):
 
 
 
+    def _fire_post_ui_loaded_when_ready(self):
+        """Waits for the QT event loop to signal it has started
+        before firing the post UI load event to listeners
+        """
+        self._ui_ready.wait()
+        self.fire_post_ui_loaded()
+
     def start(self):
-        thread = threading.Thread(target=self.fire_post_ui_loaded)
+        thread = threading.Thread(target=self._fire_post_ui_loaded_when_ready)
         thread.setDaemon(True)
         thread.start()
-        parent_path = os.path.dirname(os.path.abspath(__file__))
         # Create the icon
-        icon = QIcon(parent_path + "/icons/die.png")
+        icon = QIcon(_PARENT_PATH + "/icons/die.png")
 
         # Create the tray
         self.tray = QSystemTrayIcon()
@@ -487,6 +546,7 @@ class QTAuthenticatorUI(DICEAuthenticatorUI):
         self.menu.addAction(quit_app)
         # Add the menu to the tray
         self.tray.setContextMenu(self.menu)
+        QTimer.singleShot(0, self._ui_ready.set)
         self.app.exec_()
 
     def _debug(self):
@@ -495,66 +555,133 @@ class QTAuthenticatorUI(DICEAuthenticatorUI):
     def _preferences(self):
         pass
 
-    def _reset_lock(self):
-        result_available.clear()
-        global result
-        result = None
+    def _invoke_and_wait(self, member:str, *args):
+        """Queues a call to the named slot on the QT application and
+        blocks the calling thread on a per-request future until the
+        UI delivers the result
+
+        Args:
+            member (str): name of the slot to invoke
+            *args: string arguments to pass to the slot
+
+        Returns:
+            result delivered by the UI for this request
+        """
+        future = Future()
+        self.app._begin_request(future)
+        qargs = [Q_ARG(str, arg) for arg in args]
+        QMetaObject.invokeMethod(self.app, member, Qt.QueuedConnection, *qargs)
+        return future.result()
 
     def check_user_presence(self, msg:str="User Presence Check")->bool:
-        dice_event = DICEEvent(DICE_UI_Event.SHOW_UP)
-        dice_event.set_message(msg)
-        self._reset_lock()
-        QApplication.postEvent(self.app,dice_event)
-        result_available.wait()
-        return result
+        return self._invoke_and_wait("show_user_presence", msg)
 
     def get_user_password(self, msg:str=None)->str:
-        dice_event = DICEEvent(DICE_UI_Event.SHOW_PWD)
-        dice_event.set_message(msg)
-        self._reset_lock()
-        QApplication.postEvent(self.app,dice_event)
-        result_available.wait()
-        return result
+        return self._invoke_and_wait("get_user_password",
+            msg if msg is not None else "Enter Password")
 
     def check_user_verification(self, msg:str=None):
-        dice_event = DICEEvent(DICE_UI_Event.SHOW_UV)
-        dice_event.set_message(msg)
-        self._reset_lock()
-        QApplication.postEvent(self.app,dice_event)
-        result_available.wait()
-        return result
+        return self._invoke_and_wait("get_user_verification",
+            msg if msg is not None else "Enter Password")
 
     def register_for_user_verfication(self):
-        dice_event = DICEEvent(DICE_UI_Event.CHECK_UV)
-        self._reset_lock()
-        QApplication.postEvent(self.app,dice_event)
-        result_available.wait()
-        return result
+        return self._invoke_and_wait("register_for_user_verification")
 
     def shutdown(self):
         self._quit()
     def _quit(self):
-        for listener in self._listeners:
-            listener.shutdown()
+        self.fire_event_shutdown()
         self.app.quit()
 
+class NoncePool():
+    """Pool of pregenerated 32 byte random nonces
+
+    Keeps a deque of nonces topped up from a background thread so the
+    GUI thread does not have to make a getrandom syscall during a
+    ceremony
+    """
+    NONCE_LEN = 32
+    def __init__(self, size:int=64, refill_at:int=16):
+        """Creates the pool and fills it
+
+        Args:
+            size (int, optional): number of nonces to hold. Defaults to 64.
+            refill_at (int, optional): level below which a background
+                refill is started. Defaults to 16.
+        """
+        self._size = size
+        self._refill_at = refill_at
+        self._nonces = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+        self._fill(size)
+
+    def _fill(self, count:int):
+        """Generates count nonces in one request and adds them to the pool
+
+        Args:
+            count (int): number of nonces to generate
+        """
+        data = os.urandom(count * self.NONCE_LEN)
+        with self._lock:
+            for idx in range(count):
+                self._nonces.append(data[idx*self.NONCE_LEN:(idx+1)*self.NONCE_LEN])
+            self._refilling = False
+
+    def get(self)->bytes:
+        """Gets a nonce from the pool, starting a background refill
+        when the pool is running low
+
+        Returns:
+            bytes: 32 byte random nonce
+        """
+        with self._lock:
+            nonce = self._nonces.popleft() if self._nonces else None
+            needed = self._size - len(self._nonces)
+            start_refill = (len(self._nonces) < self._refill_at
+                and not self._refilling)
+            if start_refill:
+                self._refilling = True
+        if nonce is None:
+            nonce = os.urandom(self.NONCE_LEN)
+        if start_refill:
+            thread = threading.Thread(target=self._fill, args=(needed,))
+            thread.setDaemon(True)
+            thread.start()
+        return nonce
+
 class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
     """QT5 UI with system tray icon
 
     """
     def __init__(self):
         super().__init__()
-        self.pwd_box = None
-        self.dialog = None
-        self.pwd_box_uv = None
-        self.compendium_manager = CompendiumManager(self.enrolment_complete,self.registration_complete,self.verify_complete,self.put_complete,self.get_complete,self.compendium_error)
+        self._compendium_manager = None
         self.compendium_label = None
+        self.compendium_security_label = None
+        self._build_compendium_dialog()
         self.holding_method = None
         self.holding_msg = None
         self.dialog_showing = False
         self.challenge_nonce = None
         self.temp_key = None
+        self._nonce_pool = NoncePool()
 
+    @property
+    def compendium_manager(self)->'CompendiumManager':
+        """Lazily constructs the CompendiumManager on first use so
+        UI startup is not gated on loading preferences and keys
+
+        Returns:
+            CompendiumManager: the manager instance
+        """
+        if self._compendium_manager is None:
+            self._compendium_manager = CompendiumManager(self.enrolment_complete,
+                self.registration_complete,self.verify_complete,self.put_complete,
+                self.get_complete,self.compendium_error)
+        return self._compendium_manager
+
+    @pyqtSlot(str)
     def get_user_password(self, msg:str="Enter Password"):
         """Shows the user password dialog
 
@@ -576,10 +703,10 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
                 self.create_compendium_dialog("Register New Encryption Key")
                 self.dialog_showing=True
             self.compendium_label.setText("Register New Encryption Key")
-            self.temp_key = B64.encode(os.urandom(32))
-            security_number = random.randint(1000,9999)
-            self.compendium_security_label.setText("Security Code:" + str(security_number))
-            self.compendium_manager.put_key(self.temp_key,str(security_number))
+            self.temp_key = b64.encode(self._nonce_pool.get())
+            code = f"{secrets.randbelow(9000) + 1000}"
+            self.compendium_security_label.setText("Security Code:" + code)
+            self.compendium_manager.put_key(self.temp_key,code)
             self.holding_method = None
             self.holding_msg = None
             return
@@ -587,12 +714,13 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
             self.create_compendium_dialog("Requesting Key from Companion Device")
             self.dialog_showing=True
         self.compendium_label.setText("Requesting Key from Companion Device")
-        security_number = random.randint(1000,9999)
-        self.compendium_security_label.setText("Security Code:" + str(security_number))
-        self.compendium_manager.get_key(str(security_number))
+        code = f"{secrets.randbelow(9000) + 1000}"
+        self.compendium_security_label.setText("Security Code:" + code)
+        self.compendium_manager.get_key(code)
         self.holding_method = None
         self.holding_msg = None
 
+    @pyqtSlot()
     def register_for_user_verification(self):
         """Registers the Authenticator with the Companion Device so it
         can be used for User Verification
@@ -612,37 +740,12 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
         self.compendium_manager.register_for_uv()
         self.holding_method = None
         self.holding_msg = None
-    def create_compendium_dialog(self, task:str):
-        """Creates a generic dialog to be used when showing Companion Device messages
-
-        Args:
-            task (str): String to use in the label to indicate what is happening
+    def _build_compendium_dialog(self):
+        """Builds the generic Companion Device dialog once so it can
+        be reused for each Companion Device message
         """
-        self.dialog = QDialog(flags = Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.dialog.setAttribute(Qt.WA_TranslucentBackground)
-        parent_path = os.path.dirname(os.path.abspath(__file__))
-        outer_layout = QVBoxLayout(self.dialog)
-        outer_layout.setContentsMargins(0,0,0,0)
-        outer_frame = QFrame()
-
-        outer_frame.setProperty("bgFrame",True)
-        outer_frame.setStyleSheet("#header {font-weight:bold; text-align:center;}\n\
-        *[bgFrame='true'] {border-image: url(" + parent_path +"/icons/bgpy.png" +")\
-             0 0 0 0 stretch stretch;}")
-        outer_layout.addWidget(outer_frame)
-        layout = QVBoxLayout(outer_frame)
-        header = QLabel("DICE Key Notification")
-        header.setObjectName("header")
-        header.setAlignment(Qt.AlignCenter)
-        layout.addWidget(header)
-        self.compendium_label = QLabel(task)
-        self.compendium_label.setWordWrap(True)
-        self.compendium_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.compendium_label)
-        self.compendium_security_label = QLabel()
-        self.compendium_security_label.setWordWrap(True)
-        self.compendium_security_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(self.compendium_security_label)
+        self.compendium_label = self._make_message_label()
+        self.compendium_security_label = self._make_message_label()
 
         framebtn = QFrame()
         btnlayout = QHBoxLayout(framebtn)
@@ -652,23 +755,27 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
 
         btnlayout.addWidget(cancel_button)
         framebtn.setLayout(btnlayout)
-        layout.addWidget(framebtn)
-
-        outer_frame.setLayout(layout)
-        self.dialog.setLayout(outer_layout)
+        self._compendium_dialog = self._build_notification_dialog(
+            [self.compendium_label, self.compendium_security_label, framebtn])
 
+    def create_compendium_dialog(self, task:str):
+        """Shows the generic Companion Device dialog
 
-        screen_shape = QDesktopWidget().screenGeometry()
-        self.dialog.setGeometry(screen_shape.width()-440,0,350,200)
+        Args:
+            task (str): String to use in the label to indicate what is happening
+        """
+        self.compendium_label.setText(task)
+        self.compendium_security_label.setText("")
+        self.dialog = self._compendium_dialog
         self.dialog.show()
+        self.dialog.raise_()
 
 
     def _compendium_cancel_clicked(self):
-        global result
-        result = False
         self.dialog.close()
-        result_available.set()
+        self._deliver_result(False)
 
+    @pyqtSlot(str)
     def get_user_verification(self, msg:str="Enter Password"):
         """Shows the user verification dialog
 
@@ -699,39 +806,13 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
             self.create_compendium_dialog("Requesting Companion Device User Verification")
             self.dialog_showing=True
         self.compendium_label.setText("Requesting Companion Device User Verification")
-        security_number = random.randint(1000,9999)
-        self.compendium_security_label.setText("Security Code:" + str(security_number))
-        self.challenge_nonce = os.urandom(32)
-        self.compendium_manager.verify(msg,str(security_number),self.challenge_nonce)
+        code = f"{secrets.randbelow(9000) + 1000}"
+        self.compendium_security_label.setText("Security Code:" + code)
+        self.challenge_nonce = self._nonce_pool.get()
+        self.compendium_manager.verify(msg,code,self.challenge_nonce)
         self.holding_method = None
         self.holding_msg = None
 
-
-
-
-    def _perm_button_clicked(self, outcome:bool):
-        #self.user_presence_allow = outcome
-        self.dialog.close()
-        global result
-        result = outcome
-        result_available.set()
-
-    def _submit_pwd_button_clicked(self):
-        global result
-        result = self.pwd_box.text()
-        self.dialog.close()
-        result_available.set()
-
-
-    def _uv_button_clicked(self, approved:bool):
-        global result
-        if approved:
-            result = self.pwd_box_uv.text()
-        else:
-            result = False
-        self.dialog.close()
-        result_available.set()
-
     @pyqtSlot(str)
     def compendium_error(self, response:str):
         """Slot to receive response from CompendiumManager when an error has occurred
@@ -741,9 +822,7 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
         """
         self.dialog.close()
         self.dialog_showing=False
-        global result
-        result = CompendiumError(response)
-        result_available.set()
+        self._deliver_result(CompendiumError(response))
 
     @pyqtSlot(bool)
     def enrolment_complete(self, response:bool):
@@ -757,9 +836,7 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
             return
         self.dialog.close()
         self.dialog_showing=False
-        global result
-        result = True
-        result_available.set()
+        self._deliver_result(True)
 
     @pyqtSlot(bool)
     def registration_complete(self, response:bool):
@@ -773,9 +850,7 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
             return
         self.dialog.close()
         self.dialog_showing=False
-        global result
-        result = response
-        result_available.set()
+        self._deliver_result(response)
 
     @pyqtSlot(str)
     def verify_complete(self, response:str):
@@ -790,9 +865,8 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
         """
         self.dialog.close()
         self.dialog_showing=False
-        global result
-        result = self.compendium_manager.check_signature(response, self.challenge_nonce)
-        result_available.set()
+        self._deliver_result(
+            self.compendium_manager.check_signature(response, self.challenge_nonce))
 
     @pyqtSlot(str)
     def put_complete(self, response:str):
@@ -811,13 +885,12 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
         """
         self.dialog.close()
         self.dialog_showing=False
-        global result
         if self.temp_key is not None:
-            result = self.temp_key
+            value = self.temp_key
             self.temp_key = None
         else:
-            result = response
-        result_available.set()
+            value = response
+        self._deliver_result(value)
 
     @pyqtSlot(str)
     def get_complete(self, response:str):
@@ -830,9 +903,7 @@ class QTAuthenticatorUICompendiumApp(QTAuthenticatorUIApp):
         """
         self.dialog.close()
         self.dialog_showing=False
-        global result
-        result = response
-        result_available.set()
+        self._deliver_result(response)
 class CompendiumError():
     """Wrapper for detecting errors
     """
@@ -856,12 +927,54 @@ class Communicate(QObject):
     signal_put_complete = pyqtSignal(str)
     signal_get_complete = pyqtSignal(str)
     signal_error_complete = pyqtSignal(str)
+    signal_flush = pyqtSignal()
 
 
+class CompendiumTask(QRunnable):
+    """Runs a blocking Compendium operation on a pooled worker thread
+    so the GUI thread is not stalled by connection setup
+    """
+    def __init__(self, func, *args):
+        """Creates a task wrapping the operation and its arguments
+
+        Args:
+            func: Compendium client method to call
+            *args: arguments to pass to the method
+        """
+        super().__init__()
+        self._func = func
+        self._args = args
+
+    def run(self):
+        self._func(*self._args)
+
 class CompendiumManager():
     """Class to manage the interactions with the compendium library
 
     """
+    #__weakref__ must stay in the tuple: connecting signal_flush to
+    #the bound _drain_pending makes PyQt take a weak reference to the
+    #manager, which a fully slotted class cannot supply
+    __slots__ = ("__weakref__","_prefs","_compendium","_pool",
+        "_enrolled_cache","_enc_key_cache","_verify_key_cache",
+        "_parsed_enc_key","_verify_pubkey","_needs_reset","signals",
+        "_pending","_pending_lock","_enrol_callback","_put_callback",
+        "_get_callback","_reg_callback","_verify_callback")
+    #Maps callback kind to (preference setter name, response key to
+    #persist, cache attributes to update, completion signal name,
+    #response key to emit, or None to emit True)
+    _CB_TABLE = {
+        "enrol":("set_device_id","CD_id",
+            {"_enrolled_cache":True},"signal_enrol_complete",None),
+        "put":("set_encrypted_key","encdata",
+            {"_enc_key_cache":True,"_parsed_enc_key":None},
+            "signal_put_complete","encdata"),
+        "get":(None,None,{},"signal_get_complete","data"),
+        "reg":("set_verification_key","app_pk",
+            {"_verify_key_cache":True,"_verify_pubkey":None},
+            "signal_reg_complete",None),
+        "verify":(None,None,{},"signal_verify_complete","app_sig")}
+
     def __init__(self, enrol_cb,reg_cb,verify_cb,put_cb,get_cb,err_cb):
         """Initialise the Compendium Manager setting the QT slots to use
         as callbacks. This is necessary as this will receive messages from
@@ -886,44 +999,68 @@ class CompendiumManager():
         """
         self._prefs = DICEPreferences()
         self._compendium = Compendium()
+        self._pool = QThreadPool.globalInstance()
+        self._enrolled_cache = self._prefs.get_device_id() is not None
+        self._enc_key_cache = self._prefs.get_encrypted_key() is not None
+        self._verify_key_cache = self._prefs.get_verification_key() is not None
+        self._parsed_enc_key = None
+        self._verify_pubkey = None
+        self._needs_reset = False
         self.signals = Communicate()
-        self.signals.signal_enrol_complete.connect(enrol_cb)
-        self.signals.signal_reg_complete.connect(reg_cb)
-        self.signals.signal_verify_complete.connect(verify_cb)
-        self.signals.signal_put_complete.connect(put_cb)
-        self.signals.signal_get_complete.connect(get_cb)
-        self.signals.signal_error_complete.connect(err_cb)
+        #Completion signals are always re-emitted from the GUI thread
+        #by _drain_pending, so direct connections are safe and skip
+        #the per-emit thread affinity check of AutoConnection
+        wiring = ((self.signals.signal_enrol_complete, enrol_cb),
+            (self.signals.signal_reg_complete, reg_cb),
+            (self.signals.signal_verify_complete, verify_cb),
+            (self.signals.signal_put_complete, put_cb),
+            (self.signals.signal_get_complete, get_cb),
+            (self.signals.signal_error_complete, err_cb))
+        for signal, slot in wiring:
+            signal.connect(slot, Qt.DirectConnection)
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        self.signals.signal_flush.connect(self._drain_pending,
+            Qt.QueuedConnection)
+        self._enrol_callback = functools.partial(self._dispatch,"enrol")
+        self._put_callback = functools.partial(self._dispatch,"put")
+        self._get_callback = functools.partial(self._dispatch,"get")
+        self._reg_callback = functools.partial(self._dispatch,"reg")
+        self._verify_callback = functools.partial(self._dispatch,"verify")
 
 
     def is_enrolled(self)->bool:
         """Checks whether a Companion Device has been enrolled
 
+        The flag is populated from preferences at construction and
+        updated when enrolment completes
+
         Returns:
             bool: True if it has, False if not
         """
-        if self._prefs.get_device_id() is not None:
-            return True
-        return False
+        return self._enrolled_cache
 
     def is_encrypted_key_stored(self)->bool:
         """Checks if an encryption key has been setup
 
+        The flag is populated from preferences at construction and
+        updated when a PUT completes
+
         Returns:
             bool: True if it has, False if not
         """
-        if self._prefs.get_encrypted_key() is not None:
-            return True
-        return False
+        return self._enc_key_cache
 
     def is_verify_key_stored(self)->bool:
         """Checks if a verification key has been setup
 
+        The flag is populated from preferences at construction and
+        updated when registration completes
+
         Returns:
             bool: True if it has, False if not
         """
-        if self._prefs.get_verification_key() is not None:
-            return True
-        return False
+        return self._verify_key_cache
 
     def put_key(self, key:str, secure_code:str):
         """Makes a PUT call to the companion device to encrypt
@@ -933,7 +1070,9 @@ class CompendiumManager():
             key (str): Key encoded as Base64
             secure_code (str): Security Code string to display on companion device
         """
-        self._compendium.put_data(B64.decode(key),self._prefs.get_device_id(),"Virtual Authenticator","Encrypt Config Data",secure_code,self._put_callback)
+        self._submit(self._compendium.put_data,b64.decode(key),
+            self._prefs.get_device_id(),_APP_NAME,_PURPOSE_ENC,
+            secure_code,self._put_callback)
     def get_key(self, secure_code:str):
         """Makes a PUT call to the Companion Device to
         decrypt the stored encrypted key. This will
@@ -943,12 +1082,18 @@ class CompendiumManager():
         Args:
             secure_code (str): Security Code string to display on companion device
         """
-        self._compendium.get_data(json.loads(self._prefs.get_encrypted_key()),self._prefs.get_device_id(),"Virtual Authenticator","Encrypt Config Data",secure_code,self._get_callback)
+        if self._parsed_enc_key is None:
+            self._parsed_enc_key = _json_loads(self._prefs.get_encrypted_key())
+        self._submit(self._compendium.get_data,
+            self._parsed_enc_key,self._prefs.get_device_id(),
+            _APP_NAME,_PURPOSE_ENC,secure_code,self._get_callback)
 
     def register_for_uv(self):
         """Requests a user verification key from the Companion Device
         """
-        self._compendium.register_user_verification(self._prefs.get_device_id(),"Virtual Authenticator UV","Register for User Verification",self._reg_callback)
+        self._submit(self._compendium.register_user_verification,
+            self._prefs.get_device_id(),_APP_NAME_UV,
+            _PURPOSE_REG,self._reg_callback)
     def verify(self, message:str, secure_code:str, nonce:bytes):
         """Makes a verification challenge
 
@@ -957,107 +1102,114 @@ class CompendiumManager():
             secure_code (str): Security Code string to display on companion device
             nonce (bytes): challenge bytes to be signed
         """
-        self._compendium.perform_user_verification(self._prefs.get_device_id(),"Virtual Authenticator UV",message,secure_code, self._verify_callback,nonce)
+        self._submit(self._compendium.perform_user_verification,
+            self._prefs.get_device_id(),_APP_NAME_UV,message,secure_code,
+            self._verify_callback,nonce)
 
     def enrol_device(self):
         """Start the Enrollment process
         """
-        self._compendium.enrol_new_device(self._enrol_callback)
+        self._submit(self._compendium.enrol_new_device,
+            self._enrol_callback)
 
-    def _enrol_callback(self, data, error=None):
-        """Callback for enrollment
+    def _submit(self, func, *args):
+        """Runs a Compendium operation on the shared thread pool
+
+        Performs any deferred session reset on the pool thread before
+        the operation starts, so callers return to the GUI immediately
+        and an idle session is only torn down once more work arrives
 
-        Will store the device ID in the Authenticator preferences
         Args:
-            data (dict): Response from enrollment
-            error (ProtocolRemoteException, optional): Exception with error
-                message, or None if no error
+            func: Compendium method to call
+            *args: arguments to pass to the method
         """
-        if error is not None:
-            self._compendium.reset()
-            self.signals.signal_error_complete.emit(error.err_msg)
-            return
-        self._compendium.reset()
-        self._prefs.set_device_id(data["CD_id"])
-        self.signals.signal_enrol_complete.emit(True)
-
-    def _put_callback(self, data, error=None):
-        """Callback for PUT request that receives the
-        encrypted blob from the Companion Device.
+        self._pool.start(CompendiumTask(self._run_operation, func, *args))
 
-        This will store that data as the encrypted key
-        in the Authenticator preferences
-
-        Args:
-            data (dict): Response with encrypted data
-            error (ProtocolRemoteException, optional): Exception with error
-                message, or None if no error
+    def _run_operation(self, func, *args):
+        """Pool-side wrapper that applies a pending reset then calls
+        the Compendium operation
         """
-        if error is not None:
+        if self._needs_reset:
+            self._needs_reset = False
             self._compendium.reset()
-            self.signals.signal_error_complete.emit(error.err_msg)
-            return
-        self._prefs.set_encrypted_key(data["encdata"])
-        self._compendium.reset()
-        self.signals.signal_put_complete.emit(data["encdata"])
+        func(*args)
+
+    def _dispatch(self, kind:str, data, error=None):
+        """Shared callback for all Compendium responses
 
-    def _get_callback(self, data, error=None):
-        """Callback for the GET request
+        Each response follows the same shape: mark the Compendium
+        session for reset, persist at most one preference value,
+        update the associated caches and emit the completion signal
+        for the request kind. The per-kind differences are described
+        by _CB_TABLE rather than separate callback methods. The reset
+        itself is deferred to the next outbound operation via _submit.
+
+        Runs on a Compendium worker thread, never the GUI thread, so
+        the preference write here cannot block a repaint; only the
+        batched flush signal crosses into the GUI thread.
 
-        Receives the decrypted data which it passes back
-        to the original caller
         Args:
-            data (dict): Response with decrypted data
+            kind (str): request kind, a key of _CB_TABLE
+            data (dict): Response from the Companion Device
             error (ProtocolRemoteException, optional): Exception with error
                 message, or None if no error
         """
         if error is not None:
+            #Errors tear the session down immediately so recovery
+            #never starts from a half-finished transaction
             self._compendium.reset()
-            self.signals.signal_error_complete.emit(error.err_msg)
+            self._queue_emit("signal_error_complete", error.err_msg)
             return
-        self._compendium.reset()
-        self.signals.signal_get_complete.emit(data["data"])
-
-    def _reg_callback(self, data, error=None):
-        """Registration callback, will receive the
-        app public key which will be stored in the Authenticator
-        preferences
+        self._needs_reset = True
+        setter, store_key, cache_attrs, signal, emit_key = self._CB_TABLE[kind]
+        if setter is not None:
+            getattr(self._prefs, setter)(data[store_key])
+        for attr, value in cache_attrs.items():
+            setattr(self, attr, value)
+        self._queue_emit(signal, True if emit_key is None else data[emit_key])
+
+    def _queue_emit(self, signal:str, value):
+        """Queues a completion signal for emission from the GUI thread
+
+        Responses arrive on Compendium worker threads, where each
+        direct emit would be marshalled across threads individually.
+        Completions are appended to a pending queue instead and a
+        single flush signal is emitted only when the queue was empty,
+        so back-to-back responses share one cross-thread dispatch.
 
         Args:
-            data (dict): Response containing app public key
-            error (ProtocolRemoteException, optional): Exception with error
-                message, or None if no error
+            signal (str): name of the completion signal to emit
+            value: argument to emit with the signal
         """
-        if error is not None:
-            self._compendium.reset()
-            self.signals.signal_error_complete.emit(error.err_msg)
-            return
-        self._prefs.set_verification_key(data["app_pk"])
-        self._compendium.reset()
-        self.signals.signal_reg_complete.emit(True)
+        with self._pending_lock:
+            was_empty = not self._pending
+            self._pending.append((signal, value))
+        if was_empty:
+            self.signals.signal_flush.emit()
 
-    def _verify_callback(self, data, error=None):
-        """Verify callback that will receive the signature of
-        the challenge nonce. It will be returned to the QT UI which
-        is expected to verify it.
+    def _drain_pending(self):
+        """Emits all queued completion signals
 
-        Args:
-            data (dict): Response containing the signature of the challenge
-            error (ProtocolRemoteException, optional): Exception with error
-                message, or None if no error
+        Runs on the GUI thread via the queued flush connection, so the
+        per-kind emits here are plain direct calls into the slots
         """
-        if error is not None:
-            self._compendium.reset()
-            self.signals.signal_error_complete.emit(error.err_msg)
-            return
-        self._compendium.reset()
-        self.signals.signal_verify_complete.emit(data["app_sig"])
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                signal, value = self._pending.popleft()
+            getattr(self.signals, signal).emit(value)
 
     def check_signature(self, signature:str, nonce:bytes)->bool:
         """Utlity method to verify the signature and challenge nonce
         using the stored app public key stored in the Authenticator
         preferences
 
+        The verification key is parsed from its stored string form
+        once and the loaded public key object is reused for subsequent
+        checks; the cache is dropped when a new registration stores a
+        fresh key
+
         Args:
             signature (str): Base64 encoded signature of nonce
             nonce (bytes): challenge nonce issued to verify call
@@ -1065,4 +1217,12 @@ class CompendiumManager():
         Returns:
             bool: _description_
         """
-        return self._compendium.verify_signature(signature,nonce,self._prefs.get_verification_key())
\ No newline at end of file
+        if self._verify_pubkey is None:
+            self._verify_pubkey = CryptoUtils.load_public_key_from_string(
+                self._prefs.get_verification_key())
+        try:
+            self._verify_pubkey.verify(b64.decode(signature), nonce,
+                ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
\ No newline at end of file
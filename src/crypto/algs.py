@@ -29,10 +29,13 @@
  POSSIBILITY OF SUCH DAMAGE.
 
 """
-from enum import Enum, unique
+from enum import IntEnum, unique
 @unique
-class PUBLIC_KEY_ALG(Enum):
+class PUBLIC_KEY_ALG(IntEnum):
     """COSE Public Key algorithm values
+
+    Derived from IntEnum so members compare directly against the raw
+    COSE integer tags found in CBOR requests
     """
     RS512 =	-259 #	RSASSA-PKCS1-v1_5 using SHA-512 	IESG 	[RFC8812] 	No
     RS384 =	-258 #	RSASSA-PKCS1-v1_5 using SHA-384 	IESG 	[RFC8812] 	No
@@ -96,3 +99,6 @@ class PUBLIC_KEY_ALG(Enum):
     # AES_CCM mode 256_bit key, 128_bit tag, 7_byte nonce 		[RFC8152] 	Yes
     AES_CCM_64_128_256 = 33
 
+#Reverse lookup for CBOR/COSE parsing, a plain dict probe is
+#considerably cheaper than PUBLIC_KEY_ALG(value) on hot paths
+ALG_BY_ID = {member.value: member for member in PUBLIC_KEY_ALG}
@@ -0,0 +1,77 @@
+"""Base64 codec facade for Compendium blob handling
+
+Selects the fastest available Base64 implementation at import
+time so all blob encoding and decoding in the authenticator
+shares a single code path. Preference order is the simdutf
+bindings, then pybase64, then the stdlib, all of which operate
+on the standard alphabet used by the Companion Device.
+
+Functions:
+
+ * :func:`encode`
+ * :func:`decode`
+
+"""
+"""
+ © Copyright 2020-2022 University of Surrey
+
+ Redistribution and use in source and binary forms, with or without
+ modification, are permitted provided that the following conditions are met:
+
+ 1. Redistributions of source code must retain the above copyright notice,
+ this list of conditions and the following disclaimer.
+
+ 2. Redistributions in binary form must reproduce the above copyright notice,
+ this list of conditions and the following disclaimer in the documentation
+ and/or other materials provided with the distribution.
+
+ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+ AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+ IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+ LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+ CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+ SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+ INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+ CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ POSSIBILITY OF SUCH DAMAGE.
+
+"""
+#Tier order is SIMD first, then the stdlib. A software SWAR tier
+#below the SIMD ones is deliberately absent: binascii already
+#implements the scalar path in C, so a Python-level word-at-a-time
+#decoder built on int.from_bytes would sit behind the interpreter
+#loop it is trying to avoid and lose to the stdlib on every input
+try:
+    from simdutf import base64_encode as _b64encode
+    from simdutf import base64_decode as _b64decode
+except ImportError:
+    try:
+        from pybase64 import b64encode as _b64encode
+        from pybase64 import b64decode as _b64decode
+    except ImportError:
+        from base64 import b64encode as _b64encode
+        from base64 import b64decode as _b64decode
+
+def encode(data:bytes)->str:
+    """Encodes bytes as a standard alphabet Base64 string
+
+    Args:
+        data (bytes): raw bytes to encode
+
+    Returns:
+        str: Base64 encoded string
+    """
+    return _b64encode(data).decode("UTF-8")
+
+def decode(b64string:str)->bytes:
+    """Decodes a standard alphabet Base64 string to bytes
+
+    Args:
+        b64string (str): Base64 encoded string
+
+    Returns:
+        bytes: decoded raw bytes
+    """
+    return _b64decode(b64string)
@@ -42,11 +42,11 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 
-from crypto.crypto_provider import AuthenticatorCryptoProvider,CRYPTO_PROVIDERS
+from crypto.crypto_provider import AuthenticatorCryptoProvider
 from crypto.tpm_es256_crypto_provider import TPMES256CryptoProvider
 from crypto.es256_crypto_provider import ES256CryptoProvider
 from crypto.aes_credential_wrapper import AESCredentialWrapper
-from crypto.algs import PUBLIC_KEY_ALG
+from crypto.algs import PUBLIC_KEY_ALG, ALG_BY_ID
 from authenticator.ui import CompendiumError, DICEAuthenticatorListener,DICEAuthenticatorUI
 from authenticator.diceauthenticator import DICEAuthenticator
 from authenticator.datatypes import (DICEAuthenticatorException,AuthenticatorGetClientPINParameters,
@@ -101,7 +101,9 @@ class DICEKey(DICEAuthenticator,DICEAuthenticatorListener):
         #prepare authenticator
         self._user_verification_capable = False
 
-        self._providers = []
+        #Maps enabled COSE algorithm ids to their provider so
+        #credential parameter matching is a dict probe
+        self._providers_idx = {}
 
         self._credential_wrapper = AESCredentialWrapper()
 
@@ -225,12 +227,12 @@ class DICEKey(DICEAuthenticator,DICEAuthenticatorListener):
                 tpm_crypto_provider.load_user_key(self._storage.get_string("TPM_USER_KEY"))
 
             AuthenticatorCryptoProvider.add_provider(tpm_crypto_provider)
-            self._providers.append(tpm_crypto_provider.get_alg())
+            self._providers_idx[tpm_crypto_provider.get_alg()] = tpm_crypto_provider
         else:
 
             crypto_provider = ES256CryptoProvider()
             AuthenticatorCryptoProvider.add_provider(crypto_provider)
-            self._providers.append(crypto_provider.get_alg())
+            self._providers_idx[crypto_provider.get_alg()] = crypto_provider
 
     def shutdown(self):
         """Shuts down the authenticator
@@ -299,11 +301,10 @@ class DICEKey(DICEAuthenticator,DICEAuthenticatorListener):
             params.get_require_resident_key(), params)
         provider = None
         for cred_type in params.get_cred_types_and_pubkey_algs():
-            if cred_type["alg"] in self._providers:
-                provider=CRYPTO_PROVIDERS[cred_type["alg"]]
-                #provider = self._providers_idx[cred_type["alg"]]
+            provider = self._providers_idx.get(cred_type["alg"])
+            if provider is not None:
                 auth.debug("Found matching public key algorithm: %s",
-                    PUBLIC_KEY_ALG(provider.get_alg()).name)
+                    ALG_BY_ID[provider.get_alg()].name)
                 break
 
         if provider is None:
@@ -58,6 +58,8 @@ class CTAPHID(USBHIDListener):
     packets and sending them for processing
 
     """
+    __slots__ = ("_usbhid","_channels","_transaction","_authenticator",
+        "_keep_alive","_channel_lock_id","_channel_lock_expires")
     _BROADCAST_ID = b'\xff\xff\xff\xff'
     def __init__(self, usbhid:USBHID):
         """Instantiates a new CTAPHID object to act
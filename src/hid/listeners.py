@@ -1,4 +1,4 @@
-"""Listener abstract class
+"""Listener protocol class
 
 This needs to be in its only module due to issues
 with circular references
@@ -29,15 +29,19 @@ with circular references
  POSSIBILITY OF SUCH DAMAGE.
 
 """
-from abc import ABC, abstractmethod
+from typing import Protocol
 from hid.packets import HIDPacket
 from ctap.transaction import CTAPHIDTransaction
-class USBHIDListener(ABC):
-    """Abstract listener class to receive packets and
+class USBHIDListener(Protocol):
+    """Listener protocol to receive packets and
     notifications of when packets have been written.
 
+    Defined as a Protocol rather than an ABC so dispatch on the
+    per-packet path carries no abstract base class machinery.
+    Concrete implementations should declare __slots__ for their
+    instance attributes to keep per-instance storage compact.
     """
-    @abstractmethod
+    __slots__ = ()
     def received_packet(self, packet:HIDPacket):
         """Fired when an HIDPacket has been received
 
@@ -45,7 +49,6 @@ class USBHIDListener(ABC):
             packet (HIDPacket): packet that has been received
         """
 
-    @abstractmethod
     def response_sent(self, transaction:CTAPHIDTransaction):
         """Fired when the response has been set indicating the
         transaction is now complete